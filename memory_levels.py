@@ -5,7 +5,9 @@
 # - Mini report card persists during the 2s pause
 # - Final Report Card at the end
 
+from array import array
 from random import shuffle
+from tkinter import PhotoImage
 from turtle import *
 
 # ---------- levels: (cols, rows, background gif) ----------
@@ -31,85 +33,124 @@ level_idx = 0
 COLS = ROWS = N = 0
 TILE = 0
 LEFT = BOTTOM = 0
-tiles = []
-hide = []
+RIGHT = TOP = 0     # board edges (exclusive), for fast click rejection
+XY = []             # bottom-left screen coords of each tile, per level
+tiles = array('i')  # pair value under each tile
+hide = bytearray()  # 1 while a tile is still covered
 move_count = 0
-level_results = []  # [{'level':1,'cols':2,'rows':2,'moves':N}, ...]
-
-state = {
-    'mark': None,          # first flipped index (not yet matched)
-    'pending_hide': None,  # (a,b) mismatched pair to hide after delay
-    'advancing': False,    # True while waiting 2s to switch levels
-    'finished': False,     # True after last level
-    'recorded': False,     # set True once we record this level's result
-}
+revealed_count = 0  # tiles matched so far this level
+# per-level results, one parallel list per column
+result_levels = []
+result_cols = []
+result_rows = []
+result_moves = []
+dirty = set()       # tile indices whose cover must be repainted
+cover_ids = []      # Tk canvas rectangle id of each tile cover
+num_text_ids = []   # Tk canvas text id of each tile's number (hidden)
+shown_numbers = []  # tile indices whose number is currently visible
+
+# game states; transition() does the redraw each one needs on entry
+PLAYING = 'playing'                # waiting for the next click
+SHOW_MISMATCH = 'show_mismatch'    # wrong pair shown for 1s
+LEVEL_COMPLETE = 'level_complete'  # 2s pause before the next level
+FINISHED = 'finished'              # final report card after last level
+
+class _State:
+    """Mutable game state; slots make attribute access cheaper than dict keys."""
+    __slots__ = ('phase', 'mark', 'pending_hide')
+
+    def __init__(self):
+        self.phase = PLAYING
+        self.mark = None          # first flipped index (not yet matched)
+        self.pending_hide = None  # (a,b) mismatched pair to hide after delay
+
+state = _State()
+
+def load_backgrounds():
+    """Decode every level's background gif once, at startup."""
+    cache = {}
+    for _, _, bg in LEVELS:
+        try:
+            cache[bg] = PhotoImage(file=bg, master=canvas)
+        except Exception as e:
+            print(f"[WARN] Could not load background {bg}: {e}")
+    return cache
 
 def size_grid(cols: int, rows: int):
     """Choose TILE so cols*tile x rows*tile exactly fills window (centered)."""
-    global TILE, LEFT, BOTTOM
+    global TILE, LEFT, BOTTOM, RIGHT, TOP
     TILE = min(WIN_W // cols, WIN_H // rows)
     board_w = cols * TILE
     board_h = rows * TILE
     LEFT   = -board_w // 2
     BOTTOM = -board_h // 2
+    RIGHT  = LEFT + board_w
+    TOP    = BOTTOM + board_h
 
 def setup_level(idx: int):
     """Initialize a level by index."""
-    global COLS, ROWS, N, tiles, hide, move_count
-    state['advancing'] = False
-    state['pending_hide'] = None
-    state['mark'] = None
-    state['recorded'] = False
+    global COLS, ROWS, N, XY, tiles, hide, move_count, revealed_count
+    state.pending_hide = None
+    state.mark = None
 
     COLS, ROWS, bg = LEVELS[idx]
     N = COLS * ROWS
     move_count = 0
+    revealed_count = 0
 
     size_grid(COLS, ROWS)
+    XY = [(LEFT + (i % COLS) * TILE, BOTTOM + (i // COLS) * TILE)
+          for i in range(N)]
 
-    setup(WIN_W, WIN_H)
     title(f"Memory – Level {idx+1}/{len(LEVELS)} ({COLS}×{ROWS})")
 
-    try:
-        bgpic(bg)  # set background image (gif)
-    except Exception as e:
-        print(f"[WARN] Could not load background {bg}: {e}")
+    # swap in the preloaded background (gif); blank if it failed to load
+    canvas.itemconfigure(bg_item, image=bg_cache.get(bg, ''))
 
-    tiles = list(range(N // 2)) * 2
+    tiles = array('i', range(N // 2)) * 2
     shuffle(tiles)
-    hide = [True] * N
+    hide = bytearray(b'\x01') * N
 
-    tracer(False)
-    hideturtle()
+    draw_grid_outline()
+    make_covers()
+    make_numbers()
     onscreenclick(tap)
 
-def square(x, y, fill='#e6e6e6', border='black'):
-    """Draw a filled square (tile cover) at (x, y)."""
-    up(); goto(x, y); down()
-    color(border, fill)
-    begin_fill()
-    for _ in range(4):
-        forward(TILE); left(90)
-    end_fill()
+def make_covers(fill='#e6e6e6', border='black'):
+    """Create one canvas rectangle per tile; Tk repaints them on its own."""
+    canvas.delete('cover')
+    cover_ids.clear()
+    for i in range(N):
+        x, y = XY[i]
+        # canvas y grows downward, turtle y grows upward
+        cover_ids.append(canvas.create_rectangle(
+            x, -y, x + TILE, -(y + TILE),
+            fill=fill, outline=border, tags='cover'))
+
+def make_numbers():
+    """Create one hidden text item per tile, above the covers."""
+    canvas.delete('number')
+    num_text_ids.clear()
+    shown_numbers.clear()
+    for i in range(N):
+        x, y = XY[i]
+        num_text_ids.append(canvas.create_text(
+            x + TILE//2, -(y + TILE//2), text=str(tiles[i]),
+            font=FONT, fill='black', state='hidden', tags='number'))
 
 def index_from_xy(x, y):
     """Map screen coords to tile index or None if out of bounds."""
-    col = int((x - LEFT) // TILE)
-    row = int((y - BOTTOM) // TILE)
-    if 0 <= col < COLS and 0 <= row < ROWS:
-        return row * COLS + col
-    return None
-
-def xy_from_index(i):
-    """Map tile index to top-left screen coords."""
-    col = i % COLS
-    row = i // COLS
-    return LEFT + col * TILE, BOTTOM + row * TILE
+    if not (LEFT <= x < RIGHT and BOTTOM <= y < TOP):
+        return None
+    # on-board offsets are >= 0, so int() truncation equals floor
+    col = int(x - LEFT) // TILE
+    row = int(y - BOTTOM) // TILE
+    return row * COLS + col
 
 def tap(x, y):
     """Every valid click counts as a move; then flip/match logic with delays."""
-    global move_count
-    if state['finished'] or state['advancing'] or state['pending_hide']:
+    global move_count, revealed_count
+    if state.phase != PLAYING:
         return
 
     spot = index_from_xy(x, y)
@@ -119,29 +160,33 @@ def tap(x, y):
     # Count every left-click that flips a tile
     move_count += 1
 
-    mark = state['mark']
-    if mark is None or mark == spot:
-        state['mark'] = spot
+    mark = state.mark
+    if mark == spot:
+        return  # same tile again: counted, but nothing on screen changes
+    if mark is None:
+        state.mark = spot
+        transition(PLAYING)
         return
 
     # second click of an attempt
+    state.mark = None
     if tiles[mark] == tiles[spot]:
         hide[spot] = hide[mark] = False
-        state['mark'] = None
+        revealed_count += 2
+        dirty.update((spot, mark))
+        transition(LEVEL_COMPLETE if revealed_count == N else PLAYING)
     else:
-        state['pending_hide'] = (mark, spot)
-        state['mark'] = None
-        ontimer(hide_pending, 1000)  # 1-second flip-back
+        state.pending_hide = (mark, spot)
+        transition(SHOW_MISMATCH)
 
 def hide_pending():
-    if state['pending_hide']:
-        a, b = state['pending_hide']
+    """End of the 1s mismatch: the pair stays covered, numbers go away."""
+    if state.pending_hide:
+        a, b = state.pending_hide
         hide[a] = True
         hide[b] = True
-        state['pending_hide'] = None
-
-def all_revealed():
-    return all(not h for h in hide)
+        state.pending_hide = None
+        transition(PLAYING)
 
 def advance_after_delay():
     """Advance to next level after the 2s pause."""
@@ -149,133 +194,159 @@ def advance_after_delay():
     level_idx += 1
     if level_idx < len(LEVELS):
         setup_level(level_idx)
+        draw_full()
+        transition(PLAYING)
     else:
-        state['finished'] = True
+        transition(FINISHED)
 
 def draw_hud():
-    """Top progress text."""
-    up()
-    goto(0, WIN_H//2 - 30)
-    color('black')
-    write(f"Level {level_idx+1} / {len(LEVELS)}",
-          align='center', font=HUD_FONT)
+    """Top progress text; redrawn only on level change."""
+    h = hud_t
+    h.clear()
+    h.goto(0, WIN_H//2 - 30)
+    h.color('black')
+    h.write(f"Level {level_idx+1} / {len(LEVELS)}",
+            align='center', font=HUD_FONT)
 
 def draw_grid_outline():
-    """Faint grid so the board is always visible."""
-    color('#999999'); width(1)
-    # horizontal lines
+    """Faint grid so the board is always visible; drawn once per level."""
+    canvas.delete('grid')
+    # Each orientation is one zig-zag polyline; the hop between two lines
+    # runs along the board border, which is itself a grid line.
+    # (canvas y grows downward, turtle y grows upward)
+    horiz = []
     for r in range(ROWS+1):
-        up(); goto(LEFT, BOTTOM + r*TILE); down()
-        forward(COLS*TILE)
-    right(90)
-    # vertical lines
+        y = -(BOTTOM + r*TILE)
+        x1, x2 = (LEFT, RIGHT) if r % 2 == 0 else (RIGHT, LEFT)
+        horiz += (x1, y, x2, y)
+    vert = []
     for c in range(COLS+1):
-        up(); goto(LEFT + c*TILE, BOTTOM); down()
-        forward(ROWS*TILE)
-    left(90)
+        x = LEFT + c*TILE
+        y1, y2 = (-BOTTOM, -TOP) if c % 2 == 0 else (-TOP, -BOTTOM)
+        vert += (x, y1, x, y2)
+    for coords in (horiz, vert):
+        canvas.create_line(*coords, fill='#999999', width=1, tags='grid')
 
 def draw_results_panel():
     """Show results collected so far (left-top)."""
-    if not level_results:
+    if not result_levels:
         return
+    o = overlay_t
     margin_x = LEFT
     margin_y = WIN_H//2 - 60
-    up(); goto(margin_x + 10, margin_y)
-    color('black')
-    write("Results so far:", align='left', font=HUD_FONT)
+    o.goto(margin_x + 10, margin_y)
+    o.color('black')
+    o.write("Results so far:", align='left', font=HUD_FONT)
     y = margin_y - 22
-    for res in level_results[-6:]:  # show last up to 6 lines
-        txt = f"Lvl {res['level']}: {res['cols']}x{res['rows']} → {res['moves']} moves"
-        up(); goto(margin_x + 10, y)
-        write(txt, align='left', font=REPORT_FONT)
+    recent = zip(result_levels[-6:], result_cols[-6:],
+                 result_rows[-6:], result_moves[-6:])
+    for lvl, cols, rows, moves in recent:  # show last up to 6 lines
+        txt = f"Lvl {lvl}: {cols}x{rows} → {moves} moves"
+        o.goto(margin_x + 10, y)
+        o.write(txt, align='left', font=REPORT_FONT)
         y -= 20
 
-def record_level_if_needed():
-    """Record the just-finished level's move count once."""
-    if not state['recorded']:
-        cols, rows, _ = LEVELS[level_idx]
-        level_results.append({
-            'level': level_idx + 1,
-            'cols': cols,
-            'rows': rows,
-            'moves': move_count,
-        })
-        state['recorded'] = True
+def record_level():
+    """Record the just-finished level's move count."""
+    cols, rows, _ = LEVELS[level_idx]
+    result_levels.append(level_idx + 1)
+    result_cols.append(cols)
+    result_rows.append(rows)
+    result_moves.append(move_count)
 
 def draw_level_complete_overlay():
     """Persistent overlay shown during the 2s pause before advancing."""
+    o = overlay_t
     # Banner
-    up(); goto(0, -WIN_H//2 + 30)
-    color('blue')
+    o.goto(0, -WIN_H//2 + 30)
+    o.color('blue')
     moves_text = f"Level {level_idx+1} complete in {move_count} moves!"
-    write(moves_text, align='center', font=BANNER_FONT)
+    o.write(moves_text, align='center', font=BANNER_FONT)
     # Side panel with results so far
     draw_results_panel()
 
 def draw_final_report():
     """Final report card after last level."""
-    total = sum(r['moves'] for r in level_results)
-    up(); goto(0, 40)
-    color('blue'); write("📋 Report Card", align='center', font=BANNER_FONT)
+    o = overlay_t
+    total = sum(result_moves)
+    o.goto(0, 40)
+    o.color('blue'); o.write("📋 Report Card", align='center', font=BANNER_FONT)
     y = 10
-    color('black')
-    for res in level_results:
-        line = f"Level {res['level']:>2} ({res['cols']}x{res['rows']}): {res['moves']} moves"
-        up(); goto(0, y)
-        write(line, align='center', font=REPORT_FONT)
+    o.color('black')
+    for lvl, cols, rows, moves in zip(result_levels, result_cols,
+                                      result_rows, result_moves):
+        line = f"Level {lvl:>2} ({cols}x{rows}): {moves} moves"
+        o.goto(0, y)
+        o.write(line, align='center', font=REPORT_FONT)
         y -= 22
-    up(); goto(0, y - 10)
-    color('purple'); write(f"Total moves: {total}", align='center', font=('Arial', 18, 'bold'))
-
-def draw():
-    clear()
-
+    o.goto(0, y - 10)
+    o.color('purple'); o.write(f"Total moves: {total}", align='center', font=('Arial', 18, 'bold'))
+
+def draw_tiles(indices):
+    """Show the cover of each given tile if hidden, hide it if revealed."""
+    for i in indices:
+        canvas.itemconfigure(cover_ids[i],
+                             state='normal' if hide[i] else 'hidden')
+
+def draw_numbers():
+    """Show the numbers of the current mark and any pending mismatch."""
+    for spot in shown_numbers:
+        canvas.itemconfigure(num_text_ids[spot], state='hidden')
+    shown_numbers.clear()
+    mark = state.mark
+    if mark is not None and hide[mark]:
+        shown_numbers.append(mark)
+    if state.pending_hide:
+        shown_numbers.extend(state.pending_hide)
+    for spot in shown_numbers:
+        canvas.itemconfigure(num_text_ids[spot], state='normal')
+
+def draw_full():
+    """First frame of a level: fresh HUD and an empty overlay."""
+    overlay_t.clear()
     draw_hud()
+    dirty.clear()
 
-    # covers (only on hidden tiles)
-    for i in range(N):
-        if hide[i]:
-            x, y = xy_from_index(i)
-            square(x, y)
-
-    draw_grid_outline()
-
-    # current single mark
-    mark = state['mark']
-    if mark is not None and hide[mark]:
-        x, y = xy_from_index(mark)
-        up(); goto(x + TILE//2, y + TILE//2 - 10)
-        color('black'); write(tiles[mark], align='center', font=FONT)
-
-    # pending mismatch → show both numbers during the 1s wait
-    if state['pending_hide']:
-        a, b = state['pending_hide']
-        for spot in (a, b):
-            x, y = xy_from_index(spot)
-            up(); goto(x + TILE//2, y + TILE//2 - 10)
-            color('black'); write(tiles[spot], align='center', font=FONT)
-
-    # Finished all levels?
-    if state['finished']:
+def on_entry(phase):
+    """Perform exactly the drawing and timers that entering phase needs."""
+    if phase == FINISHED:
+        overlay_t.clear()
         draw_final_report()
-        update()
         return
 
-    # Level complete → record once, then keep overlay visible while advancing
-    if all_revealed() and state['pending_hide'] is None:
-        record_level_if_needed()
-        # Start the 2s pause exactly once
-        if not state['advancing']:
-            state['advancing'] = True
-            ontimer(advance_after_delay, 2000)
-        # Draw the overlay EVERY FRAME until level actually changes
+    draw_tiles(dirty)
+    dirty.clear()
+    draw_numbers()
+
+    if phase == SHOW_MISMATCH:
+        ontimer(hide_pending, 1000)  # 1-second flip-back
+    elif phase == LEVEL_COMPLETE:
+        record_level()
+        ontimer(advance_after_delay, 2000)
         draw_level_complete_overlay()
 
+def transition(phase):
+    """Switch to phase, redraw for it and flush the canvas once."""
+    state.phase = phase
+    on_entry(phase)
     update()
-    ontimer(draw, 80)
 
 # ---- run ----
 setup(WIN_W, WIN_H)
+screen = Screen()
+screen.tracer(0, 0)  # no auto-refresh; transition() calls update() once
+canvas = screen.getcanvas()
+# one pen per layer so clearing one never wipes the others; build them on
+# the existing screen, a bare canvas would get a second TurtleScreen that
+# wipes the canvas and turns tracing back on
+hud_t, overlay_t = (RawTurtle(screen, visible=False) for _ in range(2))
+for pen in (hud_t, overlay_t):
+    pen.penup()
+    pen.speed(0)
+bg_cache = load_backgrounds()
+bg_item = canvas.create_image(0, 0)  # single background item, image swapped per level
+canvas.tag_lower(bg_item)
 setup_level(level_idx)
-draw()
+draw_full()
+transition(PLAYING)
 done()